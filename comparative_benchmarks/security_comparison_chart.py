@@ -4,6 +4,10 @@ Security Trade-offs Comparison: ZK-SNARK vs ZK-Schnorr
 Simple line charts showing key security and performance metrics
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
@@ -12,7 +16,17 @@ BASE_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = BASE_DIR / "comparison_results" / "figures"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def create_security_comparison():
+# Line-chart score tables (0-10), built once at import
+SECURITY_PROPERTIES = ('Security\nLevel', 'Privacy', 'Simplicity', 'No\nSetup', 'Proven\nTrack', 'Quantum\nResist')
+SCHNORR_SCORES = np.array([10, 7, 10, 10, 9, 3])
+SNARK_SCORES = np.array([9, 10, 5, 0, 7, 2])
+
+# Trade-off winners: +1 for Schnorr win, -1 for SNARK win, 0 for tie
+TRADEOFF_CATEGORIES = ('Security\nBits', 'Privacy\nLevel', 'Setup\nSimple', 'Crypto\nSimple',
+                       'Proof\nSize', 'Speed')
+TRADEOFF_WINNERS = np.array([1, -1, 1, 1, 1, 1])  # Schnorr wins most except privacy
+
+def create_security_comparison(dpi: int = 300, save_pdf: bool = True):
     """Create comprehensive security comparison charts"""
     
     fig, axes = plt.subplots(2, 3, figsize=(18, 10))
@@ -213,15 +227,16 @@ def create_security_comparison():
     plt.tight_layout(rect=[0, 0.02, 1, 0.96])
     
     output_file = OUTPUT_DIR / "security_tradeoffs_comparison.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight', facecolor='white')
     print(f'✓ Security comparison chart saved: {output_file}')
     
     # Also save as PDF
-    output_pdf = output_file.with_suffix('.pdf')
-    plt.savefig(output_pdf, bbox_inches='tight', facecolor='white')
-    print(f'✓ PDF version saved: {output_pdf}')
+    if save_pdf:
+        output_pdf = output_file.with_suffix('.pdf')
+        plt.savefig(output_pdf, bbox_inches='tight', facecolor='white')
+        print(f'✓ PDF version saved: {output_pdf}')
     
-    plt.close()
+    plt.close(fig)
     
     # Print summary
     print("\n" + "="*80)
@@ -241,7 +256,7 @@ def create_security_comparison():
     print("="*80)
 
 
-def create_line_chart_comparison():
+def create_line_chart_comparison(dpi: int = 300):
     """Create line chart showing security metrics evolution"""
     
     fig, axes = plt.subplots(1, 2, figsize=(16, 6))
@@ -258,12 +273,11 @@ def create_line_chart_comparison():
     # ============================================================================
     ax1 = axes[0]
     
-    properties = ['Security\nLevel', 'Privacy', 'Simplicity', 'No\nSetup', 'Proven\nTrack', 'Quantum\nResist']
+    properties = SECURITY_PROPERTIES
     x_pos = np.arange(len(properties))
     
-    # Scores (0-10)
-    schnorr_line = [10, 7, 10, 10, 9, 3]
-    snark_line = [9, 10, 5, 0, 7, 2]
+    schnorr_line = SCHNORR_SCORES
+    snark_line = SNARK_SCORES
     
     ax1.plot(x_pos, schnorr_line, 'o-', label='ZK-Schnorr', 
             color=colors['Schnorr'], linewidth=3, markersize=10)
@@ -325,15 +339,12 @@ def create_line_chart_comparison():
     # ============================================================================
     ax2 = axes[1]
     
-    categories = ['Security\nBits', 'Privacy\nLevel', 'Setup\nSimple', 'Crypto\nSimple', 
-                  'Proof\nSize', 'Speed']
-    
-    # +1 for Schnorr win, -1 for SNARK win, 0 for tie
-    winners = [1, -1, 1, 1, 1, 1]  # Schnorr wins most except privacy
+    categories = TRADEOFF_CATEGORIES
+    winners = TRADEOFF_WINNERS
     
-    colors_bar = [colors['Schnorr'] if w > 0 else colors['SNARK'] for w in winners]
+    colors_bar = np.where(winners > 0, colors['Schnorr'], colors['SNARK'])
     
-    bars = ax2.bar(categories, [abs(w) for w in winners], 
+    bars = ax2.bar(categories, np.abs(winners), 
                    color=colors_bar, alpha=0.8, edgecolor='black', linewidth=2)
     
     winner_details = [
@@ -370,35 +381,55 @@ def create_line_chart_comparison():
     plt.tight_layout(rect=[0, 0, 1, 0.96])
     
     output_file = OUTPUT_DIR / "security_line_comparison.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight', facecolor='white')
     print(f'\n✓ Line chart comparison saved: {output_file}')
     
-    plt.close()
+    plt.close(fig)
     
     print("\n📈 Winner Count:")
-    schnorr_wins = sum(1 for w in winners if w > 0)
-    snark_wins = sum(1 for w in winners if w < 0)
+    schnorr_wins = np.count_nonzero(winners > 0)
+    snark_wins = np.count_nonzero(winners < 0)
     print(f"  • ZK-Schnorr wins: {schnorr_wins}/6 categories")
     print(f"  • ZK-SNARK wins: {snark_wins}/6 categories")
     print(f"  • Winner: {'ZK-Schnorr' if schnorr_wins > snark_wins else 'ZK-SNARK'} (for this use case)")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Security comparison charts")
+    parser.add_argument('--draft', action='store_true',
+                        help='quick preview: 100 dpi PNGs only, no PDF')
+    parser.add_argument('--parallel', action='store_true',
+                        help='render the two chart sets in separate processes')
+    args = parser.parse_args()
+    dpi = 100 if args.draft else 300
+    
     print("="*80)
     print("GENERATING SECURITY COMPARISON CHARTS")
     print("="*80)
     
-    print("\n1. Creating comprehensive 6-panel comparison...")
-    create_security_comparison()
-    
-    print("\n2. Creating line chart comparison...")
-    create_line_chart_comparison()
+    if args.parallel:
+        # Independent figures; each process renders one (output may interleave)
+        print("\nCreating 6-panel and line chart comparisons in parallel...")
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(create_security_comparison, dpi, not args.draft),
+                executor.submit(create_line_chart_comparison, dpi),
+            ]
+            for future in futures:
+                future.result()
+    else:
+        print("\n1. Creating comprehensive 6-panel comparison...")
+        create_security_comparison(dpi=dpi, save_pdf=not args.draft)
+        
+        print("\n2. Creating line chart comparison...")
+        create_line_chart_comparison(dpi=dpi)
     
     print("\n" + "="*80)
     print("✅ ALL CHARTS GENERATED SUCCESSFULLY")
     print("="*80)
     print("\nOutput files:")
     print("  • security_tradeoffs_comparison.png (6 panels)")
-    print("  • security_tradeoffs_comparison.pdf (6 panels)")
+    if not args.draft:
+        print("  • security_tradeoffs_comparison.pdf (6 panels)")
     print("  • security_line_comparison.png (line charts)")
     print("="*80)
@@ -6,11 +6,11 @@ Giải thích Cold Start vs Cache Warming
 Visualize the impact of cold start on benchmark results
 """
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import numpy as np
 from pathlib import Path
-from glob import glob
 import json
 
 # Base directory relative to this script
@@ -51,17 +51,19 @@ else:
 # Defensive copy to ensure downstream code works with standard list
 results = list(results)
 
+# Column arrays (built once, reused by every panel)
+times = np.array([r['total_time_ms'] for r in results], dtype=np.float64)
+pixels = np.array([r['pixels'] for r in results], dtype=np.float64)
+time_per_pixel = np.array([r['time_per_pixel_us'] for r in results], dtype=np.float64)
+
 # Create figure
-fig = plt.figure(figsize=(16, 12))
+fig, ((ax1, ax2), (ax3, ax4), (ax5, ax6)) = plt.subplots(3, 2, figsize=(16, 12))
 
 # ============================================================================
 # PANEL 1: Time comparison - showing cold start effect
 # ============================================================================
-ax1 = plt.subplot(3, 2, 1)
 
 sizes = [r['size'] for r in results]
-times = [r['total_time_ms'] for r in results]
-pixels = [r['pixels'] for r in results]
 
 # Highlight first two tests (cold start region)
 ax1.axvspan(0, 1.5, alpha=0.2, color='red', label='Cold Start Zone')
@@ -89,9 +91,6 @@ ax1.grid(True, alpha=0.3, axis='y')
 # ============================================================================
 # PANEL 2: Time per pixel - showing the anomaly
 # ============================================================================
-ax2 = plt.subplot(3, 2, 2)
-
-time_per_pixel = [r['time_per_pixel_us'] for r in results]
 
 ax2.plot(range(1, 9), time_per_pixel, 'o-', linewidth=2.5, markersize=7,
          color='#E74C3C', markeredgecolor='black', markeredgewidth=1.5)
@@ -104,7 +103,8 @@ ax2.text(1, time_per_pixel[0] + 0.01, '⚠️ ANOMALY!\n10× slower',
          bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7))
 
 # Expected line (average of tests 3-8)
-expected = np.mean(time_per_pixel[2:])
+stable_pixel_times = time_per_pixel[2:]
+expected = stable_pixel_times.mean()
 ax2.axhline(expected, color='green', linestyle='--', linewidth=2, label=f'Expected: {expected:.4f} μs')
 
 ax2.set_xlabel('Test Number', fontsize=12, fontweight='bold')
@@ -118,7 +118,6 @@ ax2.grid(True, alpha=0.3)
 # ============================================================================
 # PANEL 3: What happens during cold start
 # ============================================================================
-ax3 = plt.subplot(3, 2, 3)
 ax3.axis('off')
 
 cold_text = """
@@ -155,7 +154,6 @@ ax3.text(0.1, 0.5, cold_text, transform=ax3.transAxes,
 # ============================================================================
 # PANEL 4: What happens after warming
 # ============================================================================
-ax4 = plt.subplot(3, 2, 4)
 ax4.axis('off')
 
 warm_text = """
@@ -190,11 +188,12 @@ ax4.text(0.1, 0.5, warm_text, transform=ax4.transAxes,
 # ============================================================================
 # PANEL 5: Comparison chart - with/without warmup
 # ============================================================================
-ax5 = plt.subplot(3, 2, 5)
 
 categories = ['Lần 1\n(Cold)', 'Lần 2\n(Warm)', 'Lần 3-8\n(Stable)']
-without_warmup = [2.55, 2.46, np.mean([r['total_time_ms'] for r in results[2:]])]
-with_warmup = [0, 0, np.mean([r['total_time_ms'] for r in results[2:]])]  # Skip first test
+stable_times = times[2:]
+stable_avg = stable_times.mean()
+without_warmup = [2.55, 2.46, stable_avg]
+with_warmup = [0, 0, stable_avg]  # Skip first test
 
 x = np.arange(len(categories))
 width = 0.35
@@ -223,7 +222,6 @@ ax5.grid(True, alpha=0.3, axis='y')
 # ============================================================================
 # PANEL 6: Solution - Warmup strategy
 # ============================================================================
-ax6 = plt.subplot(3, 2, 6)
 ax6.axis('off')
 
 solution_text = """
@@ -276,7 +274,7 @@ output_pdf = RESULTS_DIR / "cache_warming_explanation.pdf"
 plt.savefig(output_pdf, format='pdf', bbox_inches='tight', facecolor='white')
 print(f"✅ Saved: {output_pdf}")
 
-plt.close()
+plt.close(fig)
 
 # ============================================================================
 # Create a simple comparison chart
@@ -284,8 +282,8 @@ plt.close()
 fig2, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
 # LEFT: Scaling behavior
-pixels_list = [r['pixels']/1000 for r in results]
-times_list = [r['total_time_ms'] for r in results]
+pixels_list = pixels / 1000
+times_list = times
 
 ax1.plot(pixels_list, times_list, 'o-', linewidth=2.5, markersize=6,
          color='#3498DB', markeredgecolor='black', markeredgewidth=1.5)
@@ -346,6 +344,7 @@ print(f"✅ Saved: {output_file2}")
 output_pdf2 = RESULTS_DIR / "cache_warming_comparison.pdf"
 plt.savefig(output_pdf2, format='pdf', bbox_inches='tight', facecolor='white')
 print(f"✅ Saved: {output_pdf2}")
+plt.close(fig2)
 
 print("\n" + "="*70)
 print("✅ EXPLANATION CHARTS CREATED!")
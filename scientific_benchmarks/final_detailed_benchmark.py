@@ -19,19 +19,22 @@ Metrics tracked:
 
 import sys
 import time
+import argparse
 import json
-import psutil
 import gc
+import tracemalloc
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple
+from typing import List, Tuple
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
 # Add project root
 PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = Path(__file__).resolve().parent / "detailed_benchmark_results"
 sys.path.append(str(PROJECT_ROOT / "src"))
 
 from PIL import Image
@@ -50,16 +53,43 @@ except:
     SKIMAGE = False
     print("⚠️ scikit-image not available - using numpy fallback for quality metrics")
 
+try:
+    import orjson
+    ORJSON = True
+except ImportError:
+    ORJSON = False
+
+
+GRAY_WEIGHTS = np.array([0.2989, 0.5870, 0.1140])
+
+MESSAGE_BASE = "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt "
+
+# Result fields plotted by create_charts
+CHART_COLUMNS = (
+    'pixels', 'message_length', 'embed_time_ms', 'extract_time_ms',
+    'total_time_ms', 'throughput_kbps', 'ram_used_mb', 'orig_size_kb',
+    'stego_size_kb', 'psnr_db', 'ssim', 'mse', 'bits_per_pixel',
+    'capacity_util_pct', 'success',
+)
+
 
 class FinalDetailedBenchmark:
     """Final detailed benchmark with all fixes"""
     
-    def __init__(self):
-        self.output_dir = Path(__file__).resolve().parent / "detailed_benchmark_results"
+    def __init__(self, workers: int = 1, verbose: bool = True):
+        self.output_dir = OUTPUT_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.results = []
-        self.process = psutil.Process()
+        self._source_image = None
+        self._cover = (None, None)  # (size, image) of the last resized cover
+        self._orig_png_kb = {}
+        self._message_text = ""
+        self._rng = np.random.default_rng(0)  # fallback covers, when Lenna is missing
+        self.workers = workers
+        
+        if not verbose:
+            return
         
         print("🚀 Final Detailed Performance Benchmark Suite")
         print("="*80)
@@ -71,33 +101,93 @@ class FinalDetailedBenchmark:
         print("  • Line chart visualizations")
         print("="*80)
     
-    def get_ram_mb(self) -> float:
-        """Get RAM usage in MB"""
-        return self.process.memory_info().rss / 1024 / 1024
+    def measure_ram_mb(self, img_arr: np.ndarray, message: str) -> float:
+        """Peak traced allocation (MB) of one embed + extract pass
+        
+        Runs outside the timed section: tracemalloc slows Python-level
+        allocations by more than an order of magnitude.
+        """
+        was_tracing = tracemalloc.is_tracing()
+        if was_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            stego_arr = ChaosEmbedding(image_array=img_arr).embed_message_array(message)
+            ChaosEmbedding(image_array=stego_arr, copy=False).extract_message(len(message))
+            return (tracemalloc.get_traced_memory()[1] - base) / 1024 / 1024
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+    
+    def load_source_image(self):
+        """Decode the Lenna test vector once and reuse it for every test"""
+        if self._source_image is None:
+            test_img_path = PROJECT_ROOT / "examples" / "testvectors" / "Lenna_test_image.webp"
+            if test_img_path.exists():
+                with Image.open(test_img_path) as img:
+                    self._source_image = img.convert('RGB')
+            else:
+                self._source_image = False
+        return self._source_image
     
     def create_test_image(self, width: int, height: int) -> Image.Image:
-        """Create test image"""
-        test_img_path = PROJECT_ROOT / "examples" / "testvectors" / "Lenna_test_image.webp"
-        
-        if test_img_path.exists():
-            img = Image.open(test_img_path).convert('RGB')
-            return img.resize((width, height), Image.Resampling.LANCZOS)
+        """Create test image
+        
+        The last resized cover is kept, so the message-length series (one
+        cover size, twenty messages) resamples the test vector only once.
+        """
+        source = self.load_source_image()
+        
+        if source is not False:
+            size = (width, height)
+            if self._cover[0] != size:
+                self._cover = (size, source.resize(size, Image.Resampling.LANCZOS))
+            return self._cover[1]
         else:
-            arr = np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
+            arr = self._rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
             return Image.fromarray(arr, 'RGB')
     
+    @staticmethod
+    def png_size_kb(image: Image.Image) -> float:
+        """Size (KB) of the image encoded as PNG"""
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.tell() / 1024
+    
+    def orig_png_size_kb(self, image: Image.Image) -> float:
+        """PNG size of a cover image, cached per size
+        
+        Cover images are deterministic resizes of the test vector, so the
+        message-length series would otherwise re-encode the same cover
+        twenty times. Random fallback covers are not cached.
+        """
+        if self.load_source_image() is False:
+            return self.png_size_kb(image)
+        if image.size not in self._orig_png_kb:
+            self._orig_png_kb[image.size] = self.png_size_kb(image)
+        return self._orig_png_kb[image.size]
+    
     def generate_message(self, length: int) -> str:
-        """Generate test message"""
-        base = "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt "
-        return (base * (length // len(base) + 1))[:length]
+        """Generate test message (a prefix of one text built on first use)"""
+        if len(self._message_text) < length:
+            self._message_text = MESSAGE_BASE * (length // len(MESSAGE_BASE) + 1)
+        return self._message_text[:length]
     
-    def quality_metrics(self, orig: Image.Image, stego: Image.Image) -> Tuple[float, float, float]:
-        """Calculate PSNR, SSIM, MSE"""
+    def quality_metrics(self, orig: np.ndarray, stego: np.ndarray) -> Tuple[float, float, float]:
+        """Calculate PSNR, SSIM, MSE from the cover and stego pixel arrays"""
         try:
-            orig_arr = np.array(orig, dtype=np.float64)
-            stego_arr = np.array(stego, dtype=np.float64)
+            orig_arr = np.asarray(orig, dtype=np.float64)
+            stego_arr = np.asarray(stego, dtype=np.float64)
 
-            mse_val = np.mean((orig_arr - stego_arr) ** 2)
+            if orig.dtype == np.uint8 and stego.dtype == np.uint8:
+                # The difference fits int16 and its square int32, so MSE
+                # needs no float64 temporaries
+                diff = np.subtract(orig, stego, dtype=np.int16)
+                mse_val = np.mean(np.square(diff, dtype=np.int32))
+            else:
+                mse_val = np.mean((orig_arr - stego_arr) ** 2)
 
             if SKIMAGE:
                 psnr_val = psnr(orig_arr, stego_arr, data_range=255)
@@ -109,18 +199,19 @@ class FinalDetailedBenchmark:
                     psnr_val = 20 * np.log10(255.0) - 10 * np.log10(mse_val)
 
                 # Lightweight SSIM approximation on grayscale conversion
-                orig_gray = (0.2989 * orig_arr[:, :, 0] +
-                             0.5870 * orig_arr[:, :, 1] +
-                             0.1140 * orig_arr[:, :, 2])
-                stego_gray = (0.2989 * stego_arr[:, :, 0] +
-                              0.5870 * stego_arr[:, :, 1] +
-                              0.1140 * stego_arr[:, :, 2])
+                orig_gray = orig_arr @ GRAY_WEIGHTS
+                stego_gray = stego_arr @ GRAY_WEIGHTS
 
+                # Centre each image once; variances and covariance are then
+                # dot products over the same two buffers
                 mu_x = orig_gray.mean()
                 mu_y = stego_gray.mean()
-                sigma_x = orig_gray.var()
-                sigma_y = stego_gray.var()
-                covariance = np.mean((orig_gray - mu_x) * (stego_gray - mu_y))
+                orig_gray -= mu_x
+                stego_gray -= mu_y
+                n = orig_gray.size
+                sigma_x = np.vdot(orig_gray, orig_gray) / n
+                sigma_y = np.vdot(stego_gray, stego_gray) / n
+                covariance = np.vdot(orig_gray, stego_gray) / n
 
                 c1 = (0.01 * 255) ** 2
                 c2 = (0.03 * 255) ** 2
@@ -144,7 +235,6 @@ class FinalDetailedBenchmark:
         print(f"\n📊 Test {test_id}: Image {w}×{h} ({pixels:,}px), Message {msg_len} chars", end="")
         
         gc.collect()
-        ram_before = self.get_ram_mb()
         
         try:
             # Create data
@@ -152,29 +242,24 @@ class FinalDetailedBenchmark:
             message = self.generate_message(msg_len)
             
             # Embedding
-            start = time.perf_counter()
+            start = time.perf_counter_ns()
             img_arr = np.array(image)
             embedder = ChaosEmbedding(image_array=img_arr)
-            stego_image = embedder.embed_message(message)
-            embed_time = (time.perf_counter() - start) * 1000
+            stego_arr = embedder.embed_message_array(message)
+            embed_time = (time.perf_counter_ns() - start) / 1e6
             
-            # Extraction
-            start = time.perf_counter()
-            stego_arr = np.array(stego_image)
-            extractor = ChaosEmbedding(image_array=stego_arr)
+            # Extraction straight from the stego pixels (no image round-trip)
+            start = time.perf_counter_ns()
+            extractor = ChaosEmbedding(image_array=stego_arr, copy=False)
             extracted = extractor.extract_message(msg_len)
-            extract_time = (time.perf_counter() - start) * 1000
+            extract_time = (time.perf_counter_ns() - start) / 1e6
             
-            ram_after = self.get_ram_mb()
-            ram_used = ram_after - ram_before
-            if ram_used < 0:
-                ram_used = 0.0
-            if ram_used < 0.0001:
-                estimated_usage = img_arr.nbytes / 1024 / 1024
-                ram_used = max(ram_used, estimated_usage)
+            stego_image = Image.fromarray(stego_arr.astype(np.uint8, copy=False))
             
-            # Quality
-            psnr_val, ssim_val, mse_val = self.quality_metrics(image, stego_image)
+            ram_used = self.measure_ram_mb(img_arr, message)
+            
+            # Quality (straight from the pixel arrays, no image re-decode)
+            psnr_val, ssim_val, mse_val = self.quality_metrics(img_arr, stego_arr)
             
             # Metrics
             total_time = embed_time + extract_time
@@ -185,12 +270,8 @@ class FinalDetailedBenchmark:
             max_capacity = pixels * 3
             capacity_util = (msg_len * 8 / max_capacity) * 100
             
-            orig_buffer = BytesIO()
-            stego_buffer = BytesIO()
-            image.save(orig_buffer, format='PNG')
-            stego_image.save(stego_buffer, format='PNG')
-            orig_size = len(orig_buffer.getvalue()) / 1024
-            stego_size = len(stego_buffer.getvalue()) / 1024
+            orig_size = self.orig_png_size_kb(image)
+            stego_size = self.png_size_kb(stego_image)
             
             success = (extracted[:len(message)] == message)
             
@@ -248,6 +329,15 @@ class FinalDetailedBenchmark:
                 'error': str(e)
             }
     
+    def run_points(self, points: List[Tuple[int, Tuple[int, int], int]]) -> List[dict]:
+        """Run (test_id, img_size, msg_len) points, across processes if workers > 1"""
+        if self.workers <= 1:
+            return [self.run_single_test(*point) for point in points]
+        
+        print(f"\n⚙️  Dispatching {len(points)} tests to {self.workers} worker processes")
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            return list(executor.map(_run_point, points))
+    
     def run_image_size_benchmark(self):
         """Image size scaling: 20 points from 128×128 to 1024×1024"""
         print("\n" + "="*80)
@@ -265,9 +355,8 @@ class FinalDetailedBenchmark:
         self.results = []  # Clear warmup
         print("✅ Ready")
         
-        for i, size in enumerate(sizes, 1):
-            result = self.run_single_test(i, (int(size), int(size)), msg_len)
-            self.results.append(result)
+        points = [(i, (int(size), int(size)), msg_len) for i, size in enumerate(sizes, 1)]
+        self.results.extend(self.run_points(points))
         
         self.save_and_visualize('image_size')
     
@@ -290,9 +379,8 @@ class FinalDetailedBenchmark:
         self.results = []
         print("✅ Ready")
         
-        for i, msg_len in enumerate(msg_lengths, 1):
-            result = self.run_single_test(i, img_size, int(msg_len))
-            self.results.append(result)
+        points = [(i, img_size, int(msg_len)) for i, msg_len in enumerate(msg_lengths, 1)]
+        self.results.extend(self.run_points(points))
         
         self.save_and_visualize('message_length')
     
@@ -302,13 +390,18 @@ class FinalDetailedBenchmark:
         
         # Save JSON
         json_file = self.output_dir / f"results_{btype}_{timestamp}.json"
-        with open(json_file, 'w') as f:
-            json.dump({
-                'benchmark_type': btype,
-                'timestamp': timestamp,
-                'total_tests': len(self.results),
-                'results': self.results
-            }, f, indent=2)
+        payload = {
+            'benchmark_type': btype,
+            'timestamp': timestamp,
+            'total_tests': len(self.results),
+            'results': self.results
+        }
+        if ORJSON:
+            json_file.write_bytes(orjson.dumps(
+                payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(json_file, 'w') as f:
+                json.dump(payload, f, indent=2)
         
         print(f"\n💾 Saved: {json_file.relative_to(PROJECT_ROOT)}")
         
@@ -330,13 +423,21 @@ class FinalDetailedBenchmark:
             'p4': '#FFA500', 'p5': '#E63946'
         }
         
+        # One column array per metric, built once for all panels
+        col = {key: np.array([r[key] for r in self.results], dtype=np.float64)
+               for key in CHART_COLUMNS}
+        
+        def ratio(num, den, scale=1.0):
+            """Elementwise num/den*scale, 0 where den is 0"""
+            return np.divide(num * scale, den, out=np.zeros_like(num), where=den > 0)
+        
         # X-axis data
         if btype == 'image_size':
-            x = [r['pixels'] / 1000 for r in self.results]
+            x = col['pixels'] / 1000
             xlabel = 'Image Size (K pixels)'
             title = 'Image Size Scaling'
         else:
-            x = [r['message_length'] for r in self.results]
+            x = col['message_length']
             xlabel = 'Message Length (characters)'
             title = 'Message Length Scaling'
         
@@ -351,95 +452,95 @@ class FinalDetailedBenchmark:
         
         # ROW 1: Time
         plot_metric(fig.add_subplot(gs[0, 0]),
-                   [r['embed_time_ms'] for r in self.results],
+                   col['embed_time_ms'],
                    'Elapsed Time (milliseconds)', f'1. EMBEDDING TIME\n{title}', colors['p1'])
         
         plot_metric(fig.add_subplot(gs[0, 1]),
-                   [r['extract_time_ms'] for r in self.results],
+                   col['extract_time_ms'],
                    'Elapsed Time (milliseconds)', f'2. EXTRACTION TIME\n{title}', colors['p2'])
         
         plot_metric(fig.add_subplot(gs[0, 2]),
-                   [r['total_time_ms'] for r in self.results],
+                   col['total_time_ms'],
                    'Elapsed Time (milliseconds)', f'3. TOTAL TIME\n{title}', colors['p3'])
         
         plot_metric(fig.add_subplot(gs[0, 3]),
-                   [r['throughput_kbps'] for r in self.results],
+                   col['throughput_kbps'],
                    'Throughput (kilobytes per second)', f'4. THROUGHPUT\n{title}', colors['p4'])
         
         # Efficiency
         ax = fig.add_subplot(gs[0, 4])
         if btype == 'image_size':
-            y = [r['total_time_ms']/r['pixels']*1000 for r in self.results]
+            y = ratio(col['total_time_ms'], col['pixels'], 1000)
             plot_metric(ax, y, 'Microseconds per pixel', f'5. EFFICIENCY\n{title}', colors['p5'])
         else:
-            y = [r['total_time_ms']/r['message_length'] for r in self.results]
+            y = ratio(col['total_time_ms'], col['message_length'])
             plot_metric(ax, y, 'Milliseconds per character', f'5. EFFICIENCY\n{title}', colors['p5'])
         
         # ROW 2: Memory & Size
         plot_metric(fig.add_subplot(gs[1, 0]),
-                   [r['ram_used_mb'] for r in self.results],
+                   col['ram_used_mb'],
                    'RAM (MB)', f'6. MEMORY USAGE\n{title}', colors['p1'], 'MB')
         
         plot_metric(fig.add_subplot(gs[1, 1]),
-                   [r['orig_size_kb'] for r in self.results],
+                   col['orig_size_kb'],
                    'Size (KB)', f'7. ORIGINAL SIZE\n{title}', colors['p2'], 'KB')
         
         plot_metric(fig.add_subplot(gs[1, 2]),
-                   [r['stego_size_kb'] for r in self.results],
+                   col['stego_size_kb'],
                    'Size (KB)', f'8. STEGO SIZE\n{title}', colors['p3'], 'KB')
         
         ax = fig.add_subplot(gs[1, 3])
-        y = [(r['stego_size_kb']/r['orig_size_kb']-1)*100 if r['orig_size_kb'] > 0 else 0 for r in self.results]
+        y = ratio(col['stego_size_kb'] - col['orig_size_kb'], col['orig_size_kb'], 100)
         plot_metric(ax, y, 'Overhead (%)', f'9. SIZE OVERHEAD\n{title}', colors['p4'], '%')
         
         ax = fig.add_subplot(gs[1, 4])
         if btype == 'image_size':
-            y = [r['ram_used_mb']/r['pixels']*1000 for r in self.results]
+            y = ratio(col['ram_used_mb'], col['pixels'], 1000)
             plot_metric(ax, y, 'RAM (KB/Kpixel)', f'10. RAM EFFICIENCY\n{title}', colors['p5'], '')
         else:
-            y = [r['ram_used_mb']/r['message_length'] if r['message_length'] > 0 else 0 for r in self.results]
+            y = ratio(col['ram_used_mb'], col['message_length'])
             plot_metric(ax, y, 'RAM (MB/char)', f'10. RAM EFFICIENCY\n{title}', colors['p5'], '')
         
         # ROW 3: Quality
         plot_metric(fig.add_subplot(gs[2, 0]),
-                   [r['psnr_db'] for r in self.results],
+                   col['psnr_db'],
                    'PSNR (dB)', f'11. PSNR\nHigher=Better', colors['p1'], 'dB')
         
         ax = fig.add_subplot(gs[2, 1])
-        plot_metric(ax, [r['ssim'] for r in self.results],
+        plot_metric(ax, col['ssim'],
                    'SSIM', f'12. SSIM\nHigher=Better', colors['p2'], '')
         if SKIMAGE:
             ax.set_ylim(0.9, 1.0)
         
         plot_metric(fig.add_subplot(gs[2, 2]),
-                   [r['mse'] for r in self.results],
+                   col['mse'],
                    'MSE', f'13. MSE\nLower=Better', colors['p3'], '')
         
         ax = fig.add_subplot(gs[2, 3])
-        y = [(r['psnr_db']/50)*0.5 + r['ssim']*0.5 for r in self.results]
+        y = (col['psnr_db'] / 50) * 0.5 + col['ssim'] * 0.5
         plot_metric(ax, y, 'Score', f'14. QUALITY SCORE\n(PSNR+SSIM)', colors['p4'], '')
         
         ax = fig.add_subplot(gs[2, 4])
-        max_mse = max([r['mse'] for r in self.results])
+        max_mse = col['mse'].max()
         if max_mse > 0:
-            y = [100 - (r['mse']/max_mse*100) for r in self.results]
+            y = 100 - col['mse'] / max_mse * 100
         else:
-            y = [100.0] * len(self.results)
+            y = np.full(len(self.results), 100.0)
         plot_metric(ax, y, 'Quality (%)', f'15. QUALITY RETENTION\n{title}', colors['p5'], '%')
         
         # ROW 4: Capacity & Analysis
         plot_metric(fig.add_subplot(gs[3, 0]),
-                   [r['bits_per_pixel'] for r in self.results],
+                   col['bits_per_pixel'],
                    'Bits/Pixel', f'16. EMBEDDING RATE\n{title}', colors['p1'], '')
         
         plot_metric(fig.add_subplot(gs[3, 1]),
-                   [r['capacity_util_pct'] for r in self.results],
+                   col['capacity_util_pct'],
                    'Utilization (%)', f'17. CAPACITY USAGE\n{title}', colors['p2'], '%')
         
         # Time breakdown
         ax = fig.add_subplot(gs[3, 2])
-        embed_pct = [r['embed_time_ms']/r['total_time_ms']*100 if r['total_time_ms'] > 0 else 0 for r in self.results]
-        extract_pct = [r['extract_time_ms']/r['total_time_ms']*100 if r['total_time_ms'] > 0 else 0 for r in self.results]
+        embed_pct = ratio(col['embed_time_ms'], col['total_time_ms'], 100)
+        extract_pct = ratio(col['extract_time_ms'], col['total_time_ms'], 100)
         ax.plot(x, embed_pct, 'o-', linewidth=2.5, markersize=5, 
                label='Embedding', color=colors['p1'], markeredgecolor='black', markeredgewidth=1)
         ax.plot(x, extract_pct, 's-', linewidth=2.5, markersize=5,
@@ -452,8 +553,7 @@ class FinalDetailedBenchmark:
         
         # Success rate
         ax = fig.add_subplot(gs[3, 3])
-        success = [sum(1 for r in self.results[:i+1] if r['success'])/(i+1)*100 
-                  for i in range(len(self.results))]
+        success = np.cumsum(col['success']) / np.arange(1, len(self.results) + 1) * 100
         plot_metric(ax, success, 'Success (%)', f'19. SUCCESS RATE\n{title}', colors['p4'], '%')
         ax.set_ylim(95, 105)
         
@@ -461,11 +561,11 @@ class FinalDetailedBenchmark:
         ax = fig.add_subplot(gs[3, 4])
         ax.axis('off')
         
-        avg_time = np.mean([r['total_time_ms'] for r in self.results])
-        avg_ram = np.mean([r['ram_used_mb'] for r in self.results])
-        avg_psnr = np.mean([r['psnr_db'] for r in self.results])
-        avg_ssim = np.mean([r['ssim'] for r in self.results])
-        success_count = sum(1 for r in self.results if r['success'])
+        avg_time = col['total_time_ms'].mean()
+        avg_ram = col['ram_used_mb'].mean()
+        avg_psnr = col['psnr_db'].mean()
+        avg_ssim = col['ssim'].mean()
+        success_count = int(col['success'].sum())
         
         summary = f'📊 SUMMARY\n\n'
         summary += f'Tests: {len(self.results)}\n'
@@ -497,7 +597,31 @@ class FinalDetailedBenchmark:
         plt.savefig(pdf_file, format='pdf', bbox_inches='tight', facecolor='white')
         print(f"✅ PDF: {pdf_file.relative_to(PROJECT_ROOT)}")
         
-        plt.close()
+        plt.close(fig)
+
+
+_worker_bench = None
+
+
+def _init_worker():
+    """Give each worker process its own warmed-up benchmark instance"""
+    global _worker_bench
+    _worker_bench = FinalDetailedBenchmark(verbose=False)
+    _worker_bench.run_single_test(0, (256, 256), 100)
+
+
+def _run_point(point):
+    return _worker_bench.run_single_test(*point)
+
+
+def _run_series(btype: str, workers: int) -> str:
+    """Run one benchmark series in its own process (results go to disk)"""
+    bench = FinalDetailedBenchmark(workers=workers, verbose=False)
+    if btype == 'image_size':
+        bench.run_image_size_benchmark()
+    else:
+        bench.run_message_length_benchmark()
+    return btype
 
 
 def main():
@@ -507,18 +631,33 @@ def main():
     print("📊 20 data points • Line charts • Cache warmed • Complete metrics")
     print("="*80)
     
-    bench = FinalDetailedBenchmark()
+    parser = argparse.ArgumentParser(description="Final detailed ZK-steganography benchmark")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes per benchmark (default: 1, serial)')
+    parser.add_argument('--parallel-series', action='store_true',
+                        help='run both benchmark series concurrently in separate '
+                             'processes (faster, but their timings share the CPU)')
+    args = parser.parse_args()
     
     # Run benchmarks
-    print("\n🔬 Starting Benchmark 1...")
-    bench.run_image_size_benchmark()
-    
-    print("\n🔬 Starting Benchmark 2...")
-    bench.run_message_length_benchmark()
+    if args.parallel_series:
+        print("\n🔬 Starting Benchmarks 1 and 2 in parallel...")
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for btype in executor.map(_run_series, ('image_size', 'message_length'),
+                                      (args.workers, args.workers)):
+                print(f"✅ {btype} series done")
+    else:
+        bench = FinalDetailedBenchmark(workers=args.workers)
+        
+        print("\n🔬 Starting Benchmark 1...")
+        bench.run_image_size_benchmark()
+        
+        print("\n🔬 Starting Benchmark 2...")
+        bench.run_message_length_benchmark()
     
     print("\n" + "="*80)
     print("✅ ALL BENCHMARKS COMPLETED!")
-    print(f"📁 Results in: {bench.output_dir}")
+    print(f"📁 Results in: {OUTPUT_DIR}")
     print("="*80)
 
 
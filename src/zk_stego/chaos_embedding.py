@@ -4,15 +4,26 @@ Generates pseudo-random positions for LSB embedding using chaotic systems
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 import hashlib
+from functools import lru_cache
+
+# Row i holds the MSB-first bits of byte value i
+_BITS_LUT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
 
 class ChaosGenerator:
     """Arnold Cat Map + Logistic Map for position generation"""
     
-    def __init__(self, image_width: int, image_height: int):
+    def __init__(self, image_width: int, image_height: int, cache: bool = False):
+        """
+        Args:
+            image_width, image_height: Image dimensions
+            cache: Reuse position sequences from a process-wide cache; off by
+                default so every embed/extract performs (and times) the walk
+        """
         self.width = image_width
         self.height = image_height
+        self.cache = cache
         
     def get_arnold_matrix(self) -> np.ndarray:
         """Return the Arnold Cat Map transformation matrix"""
@@ -49,61 +60,95 @@ class ChaosGenerator:
             sequence.append(x)
         return sequence
     
-    def generate_positions(
-        self, 
-        x0: int, 
-        y0: int, 
+    def generate_position_indices(
+        self,
+        x0: int,
+        y0: int,
         chaos_key: int,
         num_positions: int
-    ) -> List[Tuple[int, int]]:
-        """Generate chaos-based embedding positions (ensuring uniqueness)"""
+    ) -> np.ndarray:
+        """Generate chaos-based positions as flat pixel indices (y * width + x)
+        
+        Same sequence as generate_positions; a starting point outside the
+        image is reported as -1. With cache=True, results are shared per
+        image size and parameters (so an embed and its extract walk the map
+        once) and are returned read-only.
+        """
+        if not self.cache:
+            return self._compute_position_indices(x0, y0, chaos_key, num_positions)
+        return _cached_position_indices(
+            self.width, self.height, int(x0), int(y0), int(chaos_key), int(num_positions)
+        )
+    
+    def _compute_position_indices(
+        self,
+        x0: int,
+        y0: int,
+        chaos_key: int,
+        num_positions: int
+    ) -> np.ndarray:
+        """Uncached chaos walk behind generate_position_indices"""
         
         r = 3.7 + (chaos_key % 1000) / 10000
         logistic_x0 = (chaos_key % 10000) / 10000
         arnold_iterations = (chaos_key // 10000) % 10 + 1
         
-        positions = []
-        used_positions = set()
+        width, height = self.width, self.height
         
-        if (x0, y0) not in used_positions:
-            positions.append((x0, y0))
-            used_positions.add((x0, y0))
+        # One flag byte per pixel (index y * width + x) instead of a set of tuples
+        used = bytearray(width * height)
+        if 0 <= x0 < width and 0 <= y0 < height:
+            indices = [y0 * width + x0]
+            used[indices[0]] = 1
+        else:
+            indices = [-1]
         
         logistic_seq = self.logistic_map(logistic_x0, r, num_positions * 4)
         
         current_x, current_y = x0, y0
         logistic_idx = 0
         
-        while len(positions) < num_positions and logistic_idx < len(logistic_seq) - 1:
-            current_x, current_y = self.arnold_cat_map(
-                current_x, current_y, arnold_iterations
-            )
+        # Loop invariants hoisted; the Arnold step is inlined below
+        last_idx = len(logistic_seq) - 1
+        
+        while len(indices) < num_positions and logistic_idx < last_idx:
+            for _ in range(arnold_iterations):
+                current_x, current_y = (2 * current_x + current_y) % width, (current_x + current_y) % height
             
             dx = int(logistic_seq[logistic_idx] * 10) - 5
             dy = int(logistic_seq[logistic_idx + 1] * 10) - 5
             logistic_idx += 2
             
-            final_x = (current_x + dx) % self.width
-            final_y = (current_y + dy) % self.height
-            
-            pos = (final_x, final_y)
-            if pos not in used_positions:
-                positions.append(pos)
-                used_positions.add(pos)
+            flat = ((current_y + dy) % height) * width + (current_x + dx) % width
+            if not used[flat]:
+                indices.append(flat)
+                used[flat] = 1
+        
+        indices = np.array(indices[:num_positions], dtype=np.intp)
+        
+        if len(indices) < num_positions:
+            # Raster-order fill of the remaining free pixels
+            used_mask = np.frombuffer(used, dtype=bool)
+            free = np.flatnonzero(~used_mask)[:num_positions - len(indices)]
+            indices = np.concatenate((indices, free))
             
-        if len(positions) < num_positions:
-            for y in range(self.height):
-                for x in range(self.width):
-                    if len(positions) >= num_positions:
-                        break
-                    pos = (x, y)
-                    if pos not in used_positions:
-                        positions.append(pos)
-                        used_positions.add(pos)
-                if len(positions) >= num_positions:
-                    break
+        return indices
+    
+    def generate_positions(
+        self, 
+        x0: int, 
+        y0: int, 
+        chaos_key: int,
+        num_positions: int
+    ) -> List[Tuple[int, int]]:
+        """Generate chaos-based embedding positions (ensuring uniqueness)"""
+        indices = self.generate_position_indices(x0, y0, chaos_key, num_positions)
+        positions = list(zip((indices % self.width).tolist(), (indices // self.width).tolist()))
+        
+        if positions and indices[0] < 0:
+            positions[0] = (x0, y0)
             
-        return positions[:num_positions]
+        return positions
     
     def verify_chaos_sequence(
         self,
@@ -116,32 +161,52 @@ class ChaosGenerator:
         expected_positions = self.generate_positions(x0, y0, chaos_key, len(positions))
         return positions == expected_positions
 
+@lru_cache(maxsize=16)
+def _cached_position_indices(
+    width: int, height: int, x0: int, y0: int, chaos_key: int, num_positions: int
+) -> np.ndarray:
+    indices = ChaosGenerator(width, height)._compute_position_indices(x0, y0, chaos_key, num_positions)
+    indices.setflags(write=False)
+    return indices
+
+def clear_position_cache() -> None:
+    """Drop cached chaos position sequences (e.g. to time a cold walk)"""
+    _cached_position_indices.cache_clear()
+
 class ChaosEmbedding:
     """LSB embedding using chaos-generated positions"""
     
-    def __init__(self, image_array: np.ndarray):
-        self.image = image_array.copy()
+    def __init__(self, image_array: np.ndarray, copy: bool = True, cache_positions: bool = False):
+        """
+        Args:
+            image_array: Cover or stego image as numpy array
+            copy: Work on a private copy; pass False for read-only use
+                (extraction) or to embed into the caller's array in place
+            cache_positions: Share chaos position sequences through the
+                process-wide cache (see ChaosGenerator)
+        """
+        self.image = image_array.copy() if copy else image_array
         self.height, self.width = image_array.shape[:2]
-        self.chaos_gen = ChaosGenerator(self.width, self.height)
+        self.chaos_gen = ChaosGenerator(self.width, self.height, cache=cache_positions)
     
-    def embed_message(self, message: str, secret_key: str = "default_key") -> 'PIL.Image.Image':
-        """High-level method to embed a text message"""
-        from PIL import Image
-        
-        message_bytes = message.encode('utf-8')
-        bits = []
-        for byte in message_bytes:
-            for i in range(7, -1, -1):
-                bits.append((byte >> i) & 1)
+    def embed_message_array(self, message: str, secret_key: str = "default_key") -> np.ndarray:
+        """Embed a text message and return the stego pixels as an array"""
+        bits = bytes_to_bits(message.encode('utf-8'))
         
         chaos_key = generate_chaos_key_from_secret(secret_key)
         
         x0 = self.width // 2
         y0 = self.height // 2
         
-        stego_array = self.embed_bits(bits, x0, y0, chaos_key)
+        return self.embed_bits(bits, x0, y0, chaos_key)
+    
+    def embed_message(self, message: str, secret_key: str = "default_key") -> 'PIL.Image.Image':
+        """High-level method to embed a text message"""
+        from PIL import Image
         
-        return Image.fromarray(stego_array.astype('uint8'))
+        stego_array = self.embed_message_array(message, secret_key)
+        
+        return Image.fromarray(stego_array.astype(np.uint8, copy=False))
     
     def extract_message(self, message_length: int, secret_key: str = "default_key") -> str:
         """High-level method to extract a text message"""
@@ -154,19 +219,13 @@ class ChaosEmbedding:
         
         bits = self.extract_bits(num_bits, x0, y0, chaos_key)
         
-        message_bytes = bytearray()
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(8):
-                if i + j < len(bits):
-                    byte |= bits[i + j] << (7 - j)
-            message_bytes.append(byte)
+        message_bytes = np.packbits(np.asarray(bits, dtype=np.uint8)).tobytes()
         
         return message_bytes.decode('utf-8', errors='ignore')
     
     def embed_bits(
         self, 
-        bits: List[int], 
+        bits: Union[List[int], np.ndarray], 
         x0: int, 
         y0: int, 
         chaos_key: int,
@@ -174,16 +233,29 @@ class ChaosEmbedding:
     ) -> np.ndarray:
         """Embed bits using chaos-based positioning"""
         
-        positions = self.chaos_gen.generate_positions(x0, y0, chaos_key, len(bits))
+        indices = self.chaos_gen.generate_position_indices(x0, y0, chaos_key, len(bits))
+        
+        if len(indices) < len(bits):
+            raise ValueError(f"Not enough positions: need {len(bits)}, got {len(indices)}")
+        
+        bits = np.asarray(bits, dtype=np.uint8) & 1
         
-        if len(positions) < len(bits):
-            raise ValueError(f"Not enough positions: need {len(bits)}, got {len(positions)}")
+        valid = indices >= 0
+        if not valid.all():
+            indices, bits = indices[valid], bits[valid]
         
-        for i, bit in enumerate(bits):
-            x, y = positions[i]
-            if 0 <= x < self.width and 0 <= y < self.height:
-                pixel_value = self.image[y, x, channel]
-                self.image[y, x, channel] = (pixel_value & 0xFE) | (bit & 1)
+        # Update through a flat view of the image in place
+        if not self.image.flags.c_contiguous:
+            self.image = np.ascontiguousarray(self.image)
+        flat_pixels = self.image.reshape(-1)
+        flat_idx = indices * self.image.shape[2]
+        flat_idx += channel
+        
+        # Positions are distinct, so one gather and one scatter suffice
+        pixels = flat_pixels[flat_idx]
+        pixels &= 0xFE
+        pixels |= bits.astype(flat_pixels.dtype, copy=False)
+        flat_pixels[flat_idx] = pixels
             
         return self.image
     
@@ -194,22 +266,19 @@ class ChaosEmbedding:
         y0: int, 
         chaos_key: int,
         channel: int = 0
-    ) -> List[int]:
+    ) -> np.ndarray:
         """Extract bits using chaos-based positioning"""
         
-        positions = self.chaos_gen.generate_positions(x0, y0, chaos_key, num_bits)
-        
-        bits = []
-        for i in range(num_bits):
-            if i < len(positions):
-                x, y = positions[i]
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    lsb = self.image[y, x, channel] & 1
-                    bits.append(lsb)
-                else:
-                    bits.append(0)
-            else:
-                bits.append(0)
+        indices = self.chaos_gen.generate_position_indices(x0, y0, chaos_key, num_bits)
+        
+        # Missing or out-of-range positions read as 0
+        bits = np.zeros(num_bits, dtype=np.uint8)
+        indices = indices[:num_bits]
+        
+        valid = indices >= 0
+        found = bits[:len(indices)]
+        flat_pixels = self.image.reshape(-1)
+        found[valid] = np.bitwise_and(flat_pixels[indices[valid] * self.image.shape[2] + channel], 1)
                 
         return bits
     
@@ -252,10 +321,7 @@ class ChaosProofArtifact:
     ) -> Tuple[np.ndarray, dict]:
         """Embed proof using chaos-based LSB + metadata in PNG chunk"""
         
-        proof_bits = []
-        for byte in proof_data:
-            for i in range(7, -1, -1):
-                proof_bits.append((byte >> i) & 1)
+        proof_bits = bytes_to_bits(proof_data)
         
         chaos_embed = ChaosEmbedding(cover_image)
         
@@ -281,24 +347,21 @@ class ChaosProofArtifact:
         chaos_key = metadata["chaos_key"]
         proof_length = metadata["proof_length"]
         
-        chaos_extract = ChaosEmbedding(stego_image)
+        chaos_extract = ChaosEmbedding(stego_image, copy=False)
         proof_bits = chaos_extract.extract_bits(proof_length, x0, y0, chaos_key)
         
-        proof_bytes = bytearray()
-        for i in range(0, len(proof_bits), 8):
-            byte = 0
-            for j in range(8):
-                if i + j < len(proof_bits):
-                    byte |= proof_bits[i + j] << (7 - j)
-            proof_bytes.append(byte)
-        
-        return bytes(proof_bytes)
+        return np.packbits(proof_bits).tobytes()
 
 # Utility functions
+def bytes_to_bits(data: bytes) -> np.ndarray:
+    """Expand bytes to an MSB-first uint8 bit array via lookup table"""
+    return _BITS_LUT[np.frombuffer(data, dtype=np.uint8)].ravel()
+
 def generate_chaos_key_from_secret(secret: str) -> int:
     """Generate deterministic chaos key from secret string"""
-    hash_obj = hashlib.sha256(secret.encode())
-    return int(hash_obj.hexdigest()[:8], 16)
+    # First 4 digest bytes, big-endian: same value as int(hexdigest()[:8], 16)
+    digest = hashlib.sha256(secret.encode()).digest()
+    return int.from_bytes(digest[:4], 'big')
 
 def validate_chaos_parameters(x0: int, y0: int, width: int, height: int) -> bool:
     """Validate initial position is within image bounds"""
@@ -3,13 +3,14 @@ Hybrid ZK-SNARK Steganography: PNG Chunk + Chaos-based LSB Embedding
 Combines robust PNG chunk metadata with chaos-based position generation
 """
 
+import io
 import json
 import hashlib
 import struct
 import zlib
 import numpy as np
 from PIL import Image
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Union
 import time
 
 from .chaos_embedding import ChaosProofArtifact, generate_chaos_key_from_secret
@@ -54,8 +55,10 @@ class HybridProofArtifact:
             proof_package = self.zk_generator.generate_complete_proof(image_array, message)
             
             if proof_package:
+                # Record the embedded (compact) size once so callers need not re-serialize
+                proof_package["proof_size_bytes"] = len(serialize_proof(proof_package['proof']))
                 print("ZK proof generation completed successfully")
-                print(f"Proof size: {len(json.dumps(proof_package['proof']))} bytes")
+                print(f"Proof size: {proof_package['proof_size_bytes']} bytes")
                 print(f"Public inputs: {len(proof_package['public_inputs'])} elements")
                 print(f"Generation timestamp: {proof_package['generation_timestamp']}")
                 
@@ -102,38 +105,120 @@ class HybridProofArtifact:
         """Extract distinctive features from image to determine starting point"""
         height, width = image_array.shape[:2]
         
-        if len(image_array.shape) == 3:
+        if len(image_array.shape) == 3 and image_array.dtype == np.uint8:
+            # Integer channel mean; same truncation as mean().astype(uint8)
+            gray = (image_array.sum(axis=2, dtype=np.uint16) // image_array.shape[2]).astype(np.uint8)
+        elif len(image_array.shape) == 3:
             gray = np.mean(image_array, axis=2).astype(np.uint8)
         else:
             gray = image_array
-            
-        grad_x = np.abs(np.diff(gray, axis=1))
-        grad_y = np.abs(np.diff(gray, axis=0))
         
-        grad_x = np.pad(grad_x, ((0, 0), (0, 1)), mode='edge')
-        grad_y = np.pad(grad_y, ((0, 1), (0, 0)), mode='edge')
+        # Edge-padded |dx| + |dy| computed into two preallocated buffers
+        gradient_mag = np.empty(gray.shape, dtype=gray.dtype)
+        grad_y = np.empty_like(gradient_mag)
+        
+        np.subtract(gray[:, 1:], gray[:, :-1], out=gradient_mag[:, :-1])
+        np.abs(gradient_mag[:, :-1], out=gradient_mag[:, :-1])
+        gradient_mag[:, -1] = gradient_mag[:, -2]
         
-        gradient_mag = grad_x + grad_y
+        np.subtract(gray[1:], gray[:-1], out=grad_y[:-1])
+        np.abs(grad_y[:-1], out=grad_y[:-1])
+        grad_y[-1] = grad_y[-2]
+        
+        gradient_mag += grad_y
         
         window_size = min(16, width//4, height//4)
-        max_texture = 0
+        half = window_size // 2
         best_x, best_y = width//2, height//2
         
-        for y in range(window_size//2, height - window_size//2, window_size//4):
-            for x in range(window_size//2, width - window_size//2, window_size//4):
-                window = gradient_mag[y-window_size//2:y+window_size//2, 
-                                    x-window_size//2:x+window_size//2]
-                texture_score = np.sum(window)
-                
-                if texture_score > max_texture:
-                    max_texture = texture_score
-                    best_x, best_y = x, y
+        ys = np.array(range(half, height - half, window_size//4), dtype=np.intp)
+        xs = np.array(range(half, width - half, window_size//4), dtype=np.intp)
+        
+        if ys.size and xs.size:
+            # Summed-area table: every window sum is four lookups
+            integral = np.zeros((height + 1, width + 1), dtype=np.int64)
+            np.cumsum(gradient_mag, axis=0, out=integral[1:, 1:])
+            np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+            
+            top, bottom = ys[:, None] - half, ys[:, None] + half
+            left, right = xs[None, :] - half, xs[None, :] + half
+            texture = (integral[bottom, right] - integral[top, right]
+                       - integral[bottom, left] + integral[top, left])
+            
+            # First maximum in scan order, as long as it beats zero
+            best = int(np.argmax(texture))
+            if texture.flat[best] > 0:
+                best_y = int(ys[best // xs.size])
+                best_x = int(xs[best % xs.size])
         
         best_x = max(1, min(best_x, width-2))
         best_y = max(1, min(best_y, height-2))
         
         return best_x, best_y
         
+    def embed_hybrid_proof_array(
+        self,
+        cover_array: np.ndarray,
+        proof_json: Union[Dict[str, Any], bytes],
+        public_json: Dict[str, Any],
+        secret_key: str,
+        x0: Optional[int] = None,
+        y0: Optional[int] = None,
+        image_hash: Optional[str] = None
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Embed ZK proof into an in-memory image array without touching disk
+        
+        Args:
+            cover_array: Cover image as numpy array
+            proof_json: Parsed proof dictionary, or its compact serialization
+                from serialize_proof() when embedding the same proof repeatedly
+            public_json: Parsed public inputs dictionary
+            secret_key: Secret used to derive the chaos key
+            x0, y0: Optional starting point (feature point if omitted)
+            image_hash: Cover hash for the public inputs. embed_hybrid_proof
+                passes the SHA256 of the cover file; if omitted, the SHA256 of
+                the raw array bytes is used instead, which differs from the
+                file hash of the same cover (and costs a full copy and hash)
+            
+        Returns:
+            Tuple of (stego_array, chunk_metadata)
+        """
+        chaos_key = generate_chaos_key_from_secret(secret_key)
+        
+        if x0 is None or y0 is None:
+            feature_x, feature_y = self.extract_image_feature_point(cover_array)
+            x0 = feature_x if x0 is None else x0
+            y0 = feature_y if y0 is None else y0
+            print(f"Extracted feature-based starting point: ({x0}, {y0})")
+        else:
+            print(f"Using provided starting point: ({x0}, {y0})")
+            
+        proof_bytes = serialize_proof(proof_json)
+        
+        stego_array, chaos_metadata = self.chaos_artifact.embed_proof_chaos(
+            cover_array, proof_bytes, x0, y0, chaos_key
+        )
+        
+        chaos_metadata["proof_byte_length"] = len(proof_bytes)
+        
+        if image_hash is None:
+            image_hash = hashlib.sha256(np.ascontiguousarray(cover_array).tobytes()).hexdigest()
+        
+        chunk_metadata = {
+            "chaos": chaos_metadata,
+            "public": self._optimize_public_inputs(public_json, image_hash),
+            "meta": {
+                "vk_id": "chaos_zk_stego_20241011",
+                "version": "1.0",
+                "domain": "chaos_steganography",
+                "algorithm": "hybrid_png_chaos"
+            },
+            "timestamp": int(time.time())
+        }
+        
+        return stego_array, chunk_metadata
+        
     def embed_hybrid_proof(
         self,
         cover_image_path: str,
@@ -146,45 +231,29 @@ class HybridProofArtifact:
     ) -> bool:
         """Embed ZK proof using hybrid approach"""
         try:
-            cover_img = Image.open(cover_image_path)
-            cover_array = np.array(cover_img)
-            
-            chaos_key = generate_chaos_key_from_secret(secret_key)
-            
-            if x0 is None or y0 is None:
-                feature_x, feature_y = self.extract_image_feature_point(cover_array)
-                x0 = feature_x if x0 is None else x0
-                y0 = feature_y if y0 is None else y0
-                print(f"Extracted feature-based starting point: ({x0}, {y0})")
-            else:
-                print(f"Using provided starting point: ({x0}, {y0})")
-                
-            proof_bytes = json.dumps(proof_json, separators=(',', ':')).encode('utf-8')
-            
-            stego_array, chaos_metadata = self.chaos_artifact.embed_proof_chaos(
-                cover_array, proof_bytes, x0, y0, chaos_key
+            # Read the cover once: the same bytes are hashed and decoded
+            with open(cover_image_path, 'rb') as f:
+                cover_bytes = f.read()
+            with Image.open(io.BytesIO(cover_bytes)) as cover_img:
+                cover_array = np.array(cover_img)
+            
+            stego_array, chunk_metadata = self.embed_hybrid_proof_array(
+                cover_array, proof_json, public_json, secret_key, x0, y0,
+                image_hash=hashlib.sha256(cover_bytes).hexdigest()
             )
             
-            chaos_metadata["proof_byte_length"] = len(proof_bytes)
-            
-            image_hash = self._calculate_image_hash(cover_image_path)
+            # Encode in memory and write the file once, chunk included
+            png_buffer = io.BytesIO()
+            Image.fromarray(stego_array.astype(np.uint8, copy=False)).save(png_buffer, format='PNG')
             
-            chunk_metadata = {
-                "chaos": chaos_metadata,
-                "public": self._optimize_public_inputs(public_json, image_hash),
-                "meta": {
-                    "vk_id": "chaos_zk_stego_20241011",
-                    "version": "1.0",
-                    "domain": "chaos_steganography",
-                    "algorithm": "hybrid_png_chaos"
-                },
-                "timestamp": int(time.time())
-            }
+            png_data = self._insert_metadata_chunk(png_buffer.getvalue(), chunk_metadata)
+            if png_data is None:
+                return False
             
-            stego_img = Image.fromarray(stego_array.astype(np.uint8))
-            stego_img.save(stego_image_path)
+            with open(stego_image_path, 'wb') as f:
+                f.write(png_data)
             
-            return self._embed_metadata_chunk(stego_image_path, chunk_metadata)
+            return True
             
         except Exception as e:
             print(f"Error in hybrid embedding: {e}")
@@ -197,8 +266,8 @@ class HybridProofArtifact:
             if not metadata:
                 return None
                 
-            stego_img = Image.open(stego_image_path)
-            stego_array = np.array(stego_img)
+            with Image.open(stego_image_path) as stego_img:
+                stego_array = np.array(stego_img)
             
             proof_bytes = self.chaos_artifact.extract_proof_chaos(
                 stego_array, metadata["chaos"]
@@ -222,11 +291,6 @@ class HybridProofArtifact:
             print(f"Error in hybrid extraction: {e}")
             return None
     
-    def _calculate_image_hash(self, image_path: str) -> str:
-        """Calculate SHA256 hash of image"""
-        with open(image_path, 'rb') as f:
-            return hashlib.sha256(f.read()).hexdigest()
-    
     def _optimize_public_inputs(self, public_json: Dict[str, Any], image_hash: str) -> Dict[str, Any]:
         """Create optimized public inputs for ZK verification"""
         chaos_positions = public_json.get('positions', [])
@@ -241,28 +305,34 @@ class HybridProofArtifact:
             "timestamp": int(time.time())
         }
     
+    def _insert_metadata_chunk(self, png_data: bytes, metadata: Dict[str, Any]) -> Optional[bytes]:
+        """Return PNG bytes with the metadata chunk inserted before IEND"""
+        metadata_json = json.dumps(metadata, separators=(',', ':'))
+        metadata_bytes = metadata_json.encode('utf-8')
+        
+        iend_pos = png_data.rfind(b'IEND')
+        if iend_pos == -1:
+            return None
+            
+        iend_chunk_start = iend_pos - 4
+        
+        chunk_length = struct.pack('>I', len(metadata_bytes))
+        chunk_type = self.chunk_type
+        chunk_crc = struct.pack('>I', zlib.crc32(chunk_type + metadata_bytes) & 0xffffffff)
+        
+        full_chunk = chunk_length + chunk_type + metadata_bytes + chunk_crc
+        
+        return png_data[:iend_chunk_start] + full_chunk + png_data[iend_chunk_start:]
+    
     def _embed_metadata_chunk(self, png_path: str, metadata: Dict[str, Any]) -> bool:
         """Embed metadata in PNG chunk"""
         try:
             with open(png_path, 'rb') as f:
                 png_data = f.read()
             
-            metadata_json = json.dumps(metadata, separators=(',', ':'))
-            metadata_bytes = metadata_json.encode('utf-8')
-            
-            iend_pos = png_data.rfind(b'IEND')
-            if iend_pos == -1:
+            new_png = self._insert_metadata_chunk(png_data, metadata)
+            if new_png is None:
                 return False
-                
-            iend_chunk_start = iend_pos - 4
-            
-            chunk_length = struct.pack('>I', len(metadata_bytes))
-            chunk_type = self.chunk_type
-            chunk_crc = struct.pack('>I', zlib.crc32(chunk_type + metadata_bytes) & 0xffffffff)
-            
-            full_chunk = chunk_length + chunk_type + metadata_bytes + chunk_crc
-            
-            new_png = png_data[:iend_chunk_start] + full_chunk + png_data[iend_chunk_start:]
             
             with open(png_path, 'wb') as f:
                 f.write(new_png)
@@ -340,6 +410,32 @@ def embed_chaos_proof(
         proof_json, public_json, secret_key, x0, y0
     )
 
+def serialize_proof(proof_json: Union[Dict[str, Any], bytes]) -> bytes:
+    """Compact UTF-8 JSON encoding of a proof; bytes pass through unchanged"""
+    if isinstance(proof_json, (bytes, bytearray)):
+        return bytes(proof_json)
+    return json.dumps(proof_json, separators=(',', ':')).encode('utf-8')
+
+def embed_chaos_proof_bytes(
+    image_array: np.ndarray,
+    proof_json: Union[Dict[str, Any], bytes],
+    public_json: Dict[str, Any],
+    secret_key: str,
+    x0: Optional[int] = None,
+    y0: Optional[int] = None,
+    image_hash: Optional[str] = None
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """In-memory variant of embed_chaos_proof: no file reads or writes
+    
+    Pass the cover file's SHA256 as image_hash to get the same public inputs
+    as embed_chaos_proof; otherwise the raw array bytes are hashed.
+    """
+    hybrid = HybridProofArtifact()
+    return hybrid.embed_hybrid_proof_array(
+        image_array, proof_json, public_json, secret_key, x0, y0,
+        image_hash=image_hash
+    )
+
 def extract_chaos_proof(stego_image_path: str) -> Optional[Dict[str, Any]]:
     """High-level function to extract proof using hybrid chaos approach"""
     hybrid = HybridProofArtifact()
@@ -27,8 +27,8 @@ class MetadataMessageGenerator:
     def extract_exif_metadata(self, image_path: str) -> Dict[str, Any]:
         """Extract EXIF metadata from image"""
         try:
-            image = Image.open(image_path)
-            exifdata = image.getexif()
+            with Image.open(image_path) as image:
+                exifdata = image.getexif()
             
             metadata = {}
             for tag_id, value in exifdata.items():
@@ -6,9 +6,12 @@ import tempfile
 import hashlib
 import time
 import numpy as np
+from contextlib import suppress
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
-from PIL import Image
+
+# Circuit inputs are decimal strings; bits only ever take these two values
+_BIT_STRINGS = ('0', '1')
 
 class ZKProofGenerator:
     """ZK-SNARK proof generation and verification system"""
@@ -50,6 +53,13 @@ class ZKProofGenerator:
         except Exception as e:
             return False, "", str(e)
     
+    @staticmethod
+    def _remove_files(*paths: Path) -> None:
+        """Best-effort removal of temporary files"""
+        for path in paths:
+            with suppress(OSError):
+                path.unlink()
+    
     def setup_trusted_setup(self) -> bool:
         """Setup trusted setup if not already done"""
         if self.circuit_zkey.exists() and self.verification_key.exists():
@@ -115,7 +125,7 @@ class ZKProofGenerator:
             "x0": str(x0),
             "y0": str(y0), 
             "chaosKey": str(int(chaos_key, 16) if isinstance(chaos_key, str) else chaos_key),
-            "proofBits": [str(bit) for bit in proof_bits_padded],
+            "proofBits": [_BIT_STRINGS[bit] for bit in proof_bits_padded],
             "positions": [[str(pos[0]), str(pos[1])] for pos in positions_padded]
         }
         
@@ -147,7 +157,7 @@ class ZKProofGenerator:
         
         success, stdout, stderr = self._run_command(witness_cmd)
         
-        input_file.unlink()
+        self._remove_files(input_file)
         
         if not success:
             print(f"ERROR: Witness generation failed: {stderr}")
@@ -185,15 +195,14 @@ class ZKProofGenerator:
             with open(public_file, 'r') as f:
                 public_inputs = json.load(f)
                 
-            proof_file.unlink()
-            public_file.unlink()
-            witness_file.unlink()
+            self._remove_files(proof_file, public_file, witness_file)
             
             print("ZK proof generated successfully")
             return proof, public_inputs
             
         except Exception as e:
             print(f"ERROR: Failed to read proof files: {e}")
+            self._remove_files(proof_file, public_file)
             return None
     
     def verify_proof(self, proof: Dict[str, Any], public_inputs: List[str]) -> bool:
@@ -220,8 +229,7 @@ class ZKProofGenerator:
         
         success, stdout, stderr = self._run_command(verify_cmd)
         
-        proof_file.unlink()
-        public_file.unlink()
+        self._remove_files(proof_file, public_file)
         
         if success and "OK" in stdout:
             print("SUCCESS Proof verification PASSED")
@@ -256,10 +264,10 @@ class ZKProofGenerator:
         image_hash = hashlib.sha256(image_array.tobytes()).hexdigest()
         
         message_bytes = message.encode('utf-8')
-        proof_bits = []
-        for byte in message_bytes:
-            for i in range(8):
-                proof_bits.append((byte >> i) & 1)
+        # LSB-first bit order, as the circuit expects
+        proof_bits = np.unpackbits(
+            np.frombuffer(message_bytes, dtype=np.uint8), bitorder='little'
+        ).tolist()
         
         positions = []
         curr_x, curr_y = x0, y0
@@ -47,7 +47,7 @@ try:
     from hybrid_schnorr_stego import HybridSchnorrSteganography
     
     # Create test image
-    test_array = np.random.randint(0, 256, (512, 512, 3), dtype=np.uint8)
+    test_array = np.random.default_rng().integers(0, 256, (512, 512, 3), dtype=np.uint8)
     test_image = Image.fromarray(test_array, 'RGB')
     
     hybrid = HybridSchnorrSteganography(test_image)
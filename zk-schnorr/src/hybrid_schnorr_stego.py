@@ -148,7 +148,7 @@ class HybridSchnorrSteganography:
         # Step 1: Extract message
         print("\n1. Extracting message from stego image...")
         stego_array = np.array(stego_image)
-        extractor = ChaosEmbedding(stego_array)
+        extractor = ChaosEmbedding(stego_array, copy=False)
         
         extract_start = time.perf_counter()
         extracted_message = extractor.extract_message(message_length, embedding_key)
@@ -195,20 +195,29 @@ class HybridSchnorrSteganography:
             Dictionary with quality metrics
         """
         # PSNR
-        mse = np.mean((cover_image.astype(float) - stego_image.astype(float)) ** 2)
+        if cover_image.dtype == np.uint8 and stego_image.dtype == np.uint8:
+            # The difference fits int16 and its square int32
+            diff = np.subtract(cover_image, stego_image, dtype=np.int16)
+            mse = np.mean(np.square(diff, dtype=np.int32))
+        else:
+            mse = np.mean((cover_image.astype(float) - stego_image.astype(float)) ** 2)
         if mse == 0:
             psnr = 100.0
         else:
             psnr = 20 * np.log10(255.0 / np.sqrt(mse))
         
-        # SSIM (simplified)
+        # SSIM (simplified): centre each image once, then both variances
+        # and the covariance are dot products over the centred buffers
         c1 = (0.01 * 255) ** 2
         c2 = (0.03 * 255) ** 2
         mu1 = np.mean(cover_image)
         mu2 = np.mean(stego_image)
-        sigma1_sq = np.var(cover_image)
-        sigma2_sq = np.var(stego_image)
-        sigma12 = np.mean((cover_image - mu1) * (stego_image - mu2))
+        cover_centred = cover_image - mu1
+        stego_centred = stego_image - mu2
+        n = cover_centred.size
+        sigma1_sq = np.vdot(cover_centred, cover_centred) / n
+        sigma2_sq = np.vdot(stego_centred, stego_centred) / n
+        sigma12 = np.vdot(cover_centred, stego_centred) / n
         ssim = ((2 * mu1 * mu2 + c1) * (2 * sigma12 + c2)) / \
                ((mu1**2 + mu2**2 + c1) * (sigma1_sq + sigma2_sq + c2))
         